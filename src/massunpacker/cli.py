@@ -1,24 +1,31 @@
 """Command-line interface for massunpacker."""
 
 import logging
+import multiprocessing
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, MutableMapping, Optional
 
 import typer
 from rich.console import Console
 from rich.logging import RichHandler
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
+from rich.table import Table
+from rich.text import Text
 
-from .collision import CollisionMethod
+from .collision import CollisionMethod, FileEntry
 from .extractor import Extractor, ExtractionResult
 from .i18n import _, setup_i18n
-from .utils import ensure_directory, get_sorted_zip_files
+from .utils import ensure_directory, get_sorted_zip_files, prefetch_files
 
 app = typer.Typer(help="Mass unpack utility for zip archives")
 console = Console()
 err_console = Console(stderr=True)
 
+# Per-process extractor used by worker processes (see _init_worker)
+_worker_extractor: Extractor | None = None
+
 
 def setup_logging(verbose: bool = False) -> None:
     """
@@ -73,18 +80,26 @@ def print_summary(result: ExtractionResult) -> None:
         f"[bold]{result.archive_path.name}[/bold]: "
         f"{result.files_extracted} extracted, "
         f"{result.files_skipped} skipped, "
-        f"{result.files_renamed} renamed | "
+        f"{result.files_renamed} renamed"
+        f"{f', {result.files_linked} linked' if result.files_linked else ''} | "
         f"{result.size_compressed // 1024} KB → {result.size_uncompressed // 1024} KB "
         f"({compression_ratio:.1f}% compression)"
     )
 
-    # Print collisions to stderr
+    # Print collisions to stderr, as one table per archive
     if result.collisions:
+        table = Table(
+            title=Text(f"Collisions in {result.archive_path.name}"),
+            title_justify="left",
+            style="yellow",
+            header_style="bold yellow",
+        )
+        table.add_column("Original")
+        table.add_column("Renamed to")
         for original, new_name in result.collisions:
-            err_console.print(
-                f"[yellow]Collision[/yellow] in {result.archive_path.name}: {original} → {new_name}",
-                style="yellow",
-            )
+            # Plain Text, so file names are not parsed as markup
+            table.add_row(Text(original), Text(new_name))
+        err_console.print(table)
 
     # Print errors to stderr
     if result.errors:
@@ -92,6 +107,98 @@ def print_summary(result: ExtractionResult) -> None:
             err_console.print(f"[red]Error[/red] in {result.archive_path.name}: {error}", style="red")
 
 
+def _init_worker(
+    output_dir: Path,
+    collision_method: CollisionMethod,
+    collision_files: MutableMapping[str, FileEntry],
+    content_index: MutableMapping[tuple[int, int], str] | None,
+    verbose: bool = False,
+) -> None:
+    """
+    Initialize worker process with its own extractor.
+
+    Args:
+        output_dir: Directory where files will be extracted
+        collision_method: Method for detecting collisions
+        collision_files: Collision tracking mapping shared between workers
+        content_index: Dedup content index shared between workers (None to disable dedup)
+        verbose: Enable debug logging
+    """
+    global _worker_extractor
+
+    # Forked workers inherit the parent's handlers; spawned ones start bare
+    if not logging.getLogger().handlers:
+        setup_logging(verbose)
+    setup_i18n()
+    _worker_extractor = Extractor(
+        output_dir=output_dir,
+        collision_method=collision_method,
+        collision_files=collision_files,
+        dedup=content_index is not None,
+        content_index=content_index,
+    )
+
+
+def _extract_one(archive_path: Path) -> ExtractionResult:
+    """
+    Extract single archive in worker process.
+
+    Args:
+        archive_path: Path to zip archive
+
+    Returns:
+        ExtractionResult with statistics and errors
+    """
+    assert _worker_extractor is not None, "worker is not initialized"
+    return _worker_extractor.extract_archive(archive_path)
+
+
+def iter_results(
+    archives: list[Path],
+    output_dir: Path,
+    collision_method: CollisionMethod,
+    jobs: int = 1,
+    dedup: bool = False,
+    verbose: bool = False,
+) -> Iterator[ExtractionResult]:
+    """
+    Extract archives, yielding results as they complete.
+
+    Args:
+        archives: Archives to extract
+        output_dir: Directory where files will be extracted
+        collision_method: Method for detecting collisions
+        jobs: Number of worker processes (1 to extract in current process)
+        dedup: Hardlink files whose content was already extracted under another name
+        verbose: Enable debug logging in worker processes
+
+    Yields:
+        ExtractionResult for each archive, in completion order
+    """
+    if jobs <= 1:
+        extractor = Extractor(output_dir=output_dir, collision_method=collision_method, dedup=dedup)
+        for archive in prefetch_files(archives):
+            yield extractor.extract_archive(archive)
+        return
+
+    # Collision tracking state is shared so that workers see each other's files
+    with multiprocessing.Manager() as manager:
+        collision_files = manager.dict()
+        content_index = manager.dict() if dedup else None
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(output_dir, collision_method, collision_files, content_index, verbose),
+        ) as executor:
+            futures = [executor.submit(_extract_one, archive) for archive in archives]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+
 @app.command()
 def main(
     patterns: list[str] = typer.Argument(..., help="Glob pattern(s) or zip file(s) (e.g., 'data/*.zip' or file1.zip file2.zip)"),
@@ -111,6 +218,12 @@ def main(
         "-c",
         help="Method for collision detection: size, hash-sha256, hash-fast",
     ),
+    dedup: bool = typer.Option(
+        False, "--dedup", help="Hardlink files whose content was already extracted under another name"
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of parallel worker processes (speedup is limited, see README)"
+    ),
     no_progress: bool = typer.Option(False, "--no-progress", help="Disable progress bar"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ) -> None:
@@ -121,6 +234,7 @@ def main(
         massunpacker "data/*.zip" --extract-to=output
         massunpacker *.zip --count=10
         massunpacker file1.zip file2.zip file3.zip
+        massunpacker "*.zip" --jobs=4
     """
     setup_i18n()
     setup_logging(verbose)
@@ -148,32 +262,42 @@ def main(
 
         console.print(f"Found {len(archives)} archive(s) to process")
 
-        # Create extractor
-        extractor = Extractor(output_dir=extract_to, collision_method=collision_method)
+        jobs = min(jobs, len(archives))
+        results = iter_results(
+            archives, extract_to, collision_method, jobs=jobs, dedup=dedup, verbose=verbose
+        )
 
         # Process archives
         total_extracted = 0
         total_skipped = 0
         total_renamed = 0
+        total_linked = 0
         total_errors = 0
 
+        def handle_result(result: ExtractionResult) -> None:
+            nonlocal total_extracted, total_skipped, total_renamed, total_linked, total_errors
+
+            print_summary(result)
+
+            total_extracted += result.files_extracted
+            total_skipped += result.files_skipped
+            total_renamed += result.files_renamed
+            total_linked += result.files_linked
+            total_errors += len(result.errors)
+
+            # Move archive
+            archive = result.archive_path
+            target_dir = mv_ok if result.success and not result.errors else mv_er
+            try:
+                archive.rename(target_dir / archive.name)
+            except FileNotFoundError:
+                err_console.print(f"[yellow]Warning:[/yellow] {archive.name} is gone, not moved")
+
         if no_progress or not sys.stdout.isatty():
             # Simple output without progress bar
-            for i, archive in enumerate(archives, 1):
-                console.print(f"[{i}/{len(archives)}] Processing {archive.name}...")
-                result = extractor.extract_archive(archive)
-                print_summary(result)
-
-                total_extracted += result.files_extracted
-                total_skipped += result.files_skipped
-                total_renamed += result.files_renamed
-                total_errors += len(result.errors)
-
-                # Move archive
-                if result.success and not result.errors:
-                    archive.rename(mv_ok / archive.name)
-                else:
-                    archive.rename(mv_er / archive.name)
+            for i, result in enumerate(results, 1):
+                console.print(f"[{i}/{len(archives)}] Processed {result.archive_path.name}")
+                handle_result(result)
         else:
             # With progress bar
             with Progress(
@@ -186,29 +310,17 @@ def main(
             ) as progress:
                 task = progress.add_task("Extracting archives...", total=len(archives))
 
-                for archive in archives:
-                    progress.update(task, description=f"Processing {archive.name}")
-                    result = extractor.extract_archive(archive)
-                    print_summary(result)
-
-                    total_extracted += result.files_extracted
-                    total_skipped += result.files_skipped
-                    total_renamed += result.files_renamed
-                    total_errors += len(result.errors)
-
-                    # Move archive
-                    if result.success and not result.errors:
-                        archive.rename(mv_ok / archive.name)
-                    else:
-                        archive.rename(mv_er / archive.name)
-
+                for result in results:
+                    progress.update(task, description=f"Processed {result.archive_path.name}")
+                    handle_result(result)
                     progress.advance(task)
 
         # Print final summary
         console.print("\n[bold green]Processing complete![/bold green]")
         console.print(
             f"Total: {total_extracted} extracted, {total_skipped} skipped, "
-            f"{total_renamed} renamed, {total_errors} errors"
+            f"{total_renamed} renamed, "
+            f"{f'{total_linked} linked, ' if dedup else ''}{total_errors} errors"
         )
 
     except KeyboardInterrupt:
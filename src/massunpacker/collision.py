@@ -2,9 +2,12 @@
 
 import hashlib
 import logging
+import mmap
+import os
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, BinaryIO, Callable, Container, Dict, MutableMapping, Tuple
 
 try:
     import xxhash
@@ -15,6 +18,17 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Max seconds to wait for another worker to finish writing a reserved path
+RESERVATION_TIMEOUT = 60.0
+
+# Tracked file: (size, hash, crc32), hash and crc32 are None when unknown
+FileEntry = Tuple[int, str | None, int | None]
+
+# Files at least this large are hashed through mmap in a single update() call
+MMAP_THRESHOLD = 64 * 1024
+# Read size for hashing smaller files
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 class CollisionMethod(Enum):
     """Methods for detecting file collisions."""
@@ -27,18 +41,43 @@ class CollisionMethod(Enum):
 class CollisionTracker:
     """Track extracted files and detect collisions."""
 
-    def __init__(self, method: CollisionMethod = CollisionMethod.HASH_FAST):
+    def __init__(
+        self,
+        method: CollisionMethod = CollisionMethod.HASH_FAST,
+        files: MutableMapping[str, FileEntry] | None = None,
+        content_index: MutableMapping[Tuple[int, int], str] | None = None,
+    ):
         """
         Initialize collision tracker.
 
         Args:
             method: Method to use for collision detection
+            files: Mapping to track files in (None for a private dict).
+                Pass a shared mapping (e.g. ``multiprocessing.Manager().dict()``)
+                to detect collisions across worker processes.
+            content_index: Mapping to index files by (size, crc32) in, to find
+                identical files under other names (None to disable)
         """
         self.method = method
-        # Map: relative_path -> (size, hash)
-        self.files: Dict[str, Tuple[int, str | None]] = {}
-
-    def _compute_hash(self, file_path: Path) -> str:
+        # Hasher constructor for selected method (None if hashing is not needed)
+        self._new_hasher: Callable[[], Any] | None
+        if method == CollisionMethod.SIZE:
+            self._new_hasher = None
+        elif method == CollisionMethod.HASH_FAST:
+            self._new_hasher = xxhash.xxh64 if XXHASH_AVAILABLE else hashlib.blake2b
+        else:  # HASH_SHA256
+            self._new_hasher = hashlib.sha256
+        # Map: relative_path -> (size, hash, crc32)
+        self.files: MutableMapping[str, FileEntry] = files if files is not None else {}
+        # Entry marking a reserved path; token is unique per process, so two
+        # workers cannot both win the same path
+        self._reservation: FileEntry = (-1, f"reserved-{os.getpid()}", None)
+        # Map: (size, crc32) -> relative_path of first file with that content
+        self.content_index = content_index
+        # Map: (directory, stem, suffix) -> next counter for generate_unique_name
+        self.name_counters: Dict[Tuple[str, str, str], int] = {}
+
+    def _compute_hash(self, file_path: Path | str) -> str:
         """
         Compute file hash based on selected method.
 
@@ -48,49 +87,137 @@ class CollisionTracker:
         Returns:
             Hash string or empty string if not needed
         """
-        if self.method == CollisionMethod.SIZE:
+        if self._new_hasher is None:
             return ""
 
-        # Choose hash algorithm
-        if self.method == CollisionMethod.HASH_FAST:
-            if XXHASH_AVAILABLE:
-                hasher = xxhash.xxh64()
-            else:
-                hasher = hashlib.blake2b()
-        else:  # HASH_SHA256
-            hasher = hashlib.sha256()
+        hasher = self._new_hasher()
 
-        # Compute hash in chunks
         with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                # Small file, mapping it costs more than reading
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    hasher.update(chunk)
+            else:
+                # Let the hasher run over the whole file in one C call
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+
+        return hasher.hexdigest()
+
+    def hash_stream(self, stream: BinaryIO) -> str:
+        """
+        Compute hash of stream contents based on selected method.
+
+        Args:
+            stream: Binary stream to read until EOF
+
+        Returns:
+            Hash string or empty string if not needed
+        """
+        if self._new_hasher is None:
+            return ""
+
+        hasher = self._new_hasher()
+        while chunk := stream.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
 
         return hasher.hexdigest()
 
-    def check_collision(self, relative_path: str, file_path: Path) -> Tuple[bool, bool]:
+    def file_hash(self, relative_path: str, file_path: Path | str) -> str:
+        """
+        Get hash of registered file, computing and storing it on first use.
+
+        Args:
+            relative_path: Relative path in archive
+            file_path: Actual file path
+
+        Returns:
+            Hash string or empty string if not needed
+        """
+        size, file_hash, crc = self.files[relative_path]
+        if file_hash is None:
+            file_hash = self._compute_hash(file_path)
+            self.files[relative_path] = (size, file_hash, crc)
+        return file_hash
+
+    def find_duplicate(self, size: int, crc: int) -> str | None:
+        """
+        Find registered file that probably has the same content.
+
+        Args:
+            size: File size in bytes
+            crc: CRC32 of file
+
+        Returns:
+            Relative path of file with same size and CRC32, or None
+        """
+        if self.content_index is None:
+            return None
+        return self.content_index.get((size, crc))
+
+    def _index_content(self, relative_path: str, size: int, crc: int | None) -> None:
+        """
+        Add file to content index, unless its content is indexed already.
+
+        Args:
+            relative_path: Relative path in archive
+            size: File size in bytes
+            crc: CRC32 of file, if known
+        """
+        if self.content_index is not None and crc is not None:
+            self.content_index.setdefault((size, crc), relative_path)
+
+    def check_collision(
+        self,
+        relative_path: str,
+        file_path: Path | str,
+        existing_path: Path | str | None = None,
+        crc: int | None = None,
+    ) -> Tuple[bool, bool]:
         """
         Check if file collides with existing file.
 
+        Hashes are computed lazily: a new file is registered by size only, and
+        both files are hashed when another file of the same size collides with it.
+        If CRC32 of both files is known (e.g. from zip headers), files with
+        different CRC32 are told apart without hashing.
+
         Args:
             relative_path: Relative path in archive
             file_path: Actual file path to check
+            existing_path: Path of already registered file with this relative path,
+                needed to hash it (if None or missing, files are considered different)
+            crc: CRC32 of file, if known
 
         Returns:
             Tuple of (is_collision, files_are_identical)
-            - (False, False): No collision, new file
+            - (False, False): No collision, new file; the path is reserved for it
+              until it is moved in place and registered with register_precomputed()
             - (True, True): Collision, but files are identical (can skip)
             - (True, False): Collision, files are different (need rename)
         """
-        if relative_path not in self.files:
-            # No collision, new file
-            size = file_path.stat().st_size
-            file_hash = self._compute_hash(file_path) if self.method != CollisionMethod.SIZE else None
-            self.files[relative_path] = (size, file_hash)
-            return False, False
+        current_size = os.stat(file_path).st_size
+
+        # Another worker may still be writing the path: wait until it registers
+        # the file (or gives up on it) rather than renaming a possibly identical file
+        deadline = time.monotonic() + RESERVATION_TIMEOUT
+        delay = 0.001
+        while True:
+            if self.reserve(relative_path):
+                # No collision, new file
+                return False, False
+
+            entry = self.files.get(relative_path)
+            if entry is None:
+                continue
+            if entry[0] >= 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
 
         # Collision detected
-        existing_size, existing_hash = self.files[relative_path]
-        current_size = file_path.stat().st_size
+        existing_size, existing_hash, existing_crc = entry
 
         # Different sizes = different files
         if current_size != existing_size:
@@ -101,45 +228,116 @@ class CollisionTracker:
             # Only comparing sizes, assume identical
             return True, True
 
-        current_hash = self._compute_hash(file_path)
-        files_identical = current_hash == existing_hash
+        # Different CRC32 = different files, no need to hash
+        if crc is not None and existing_crc is not None and crc != existing_crc:
+            return True, False
+
+        if existing_hash is None:
+            if existing_path is None:
+                return True, False
+            try:
+                existing_hash = self.file_hash(relative_path, existing_path)
+            except FileNotFoundError:
+                # Removed since it was registered
+                return True, False
+
+        files_identical = self._compute_hash(file_path) == existing_hash
 
         return True, files_identical
 
-    def register_file(self, relative_path: str, file_path: Path) -> None:
+    def register_file(self, relative_path: str, file_path: Path | str, crc: int | None = None) -> bool:
         """
         Register a file in tracker.
 
         Args:
             relative_path: Relative path in archive
             file_path: Actual file path
+            crc: CRC32 of file, if known
+
+        Returns:
+            True if registered, False if the path is already taken
+        """
+        if not self.reserve(relative_path):
+            return False
+
+        size = os.stat(file_path).st_size
+        self.files[relative_path] = (size, None, crc)
+        self._index_content(relative_path, size, crc)
+        return True
+
+    def reserve(self, relative_path: str) -> bool:
+        """
+        Reserve path for a file that is about to be written.
+
+        Until the file is registered, the reserved entry never matches another
+        file: check_collision() waits for it to be registered, and treats the
+        files as different if that takes longer than RESERVATION_TIMEOUT.
+
+        Args:
+            relative_path: Relative path in archive
+
+        Returns:
+            True if reserved, False if the path is already taken
+        """
+        # A single setdefault both checks and claims the path (one round trip
+        # on a shared mapping)
+        return self.files.setdefault(relative_path, self._reservation) == self._reservation
+
+    def register_precomputed(
+        self, relative_path: str, size: int, file_hash: str | None = None, crc: int | None = None
+    ) -> None:
+        """
+        Register a file whose size (and optionally hash) is already known.
+
+        Args:
+            relative_path: Relative path in archive
+            size: File size in bytes
+            file_hash: File hash (None to compute it lazily on collision)
+            crc: CRC32 of file, if known
+        """
+        self.files[relative_path] = (size, file_hash, crc)
+        self._index_content(relative_path, size, crc)
+
+    def discard(self, relative_path: str) -> None:
+        """
+        Forget a reserved or registered file.
+
+        Args:
+            relative_path: Relative path in archive
         """
-        size = file_path.stat().st_size
-        file_hash = self._compute_hash(file_path) if self.method != CollisionMethod.SIZE else None
-        self.files[relative_path] = (size, file_hash)
+        self.files.pop(relative_path, None)
 
 
-def generate_unique_name(base_path: Path, original_name: str) -> Path:
+def generate_unique_name(
+    base_path: Path | str,
+    original_name: str,
+    taken: Container[str] = (),
+    counters: Dict[Tuple[str, str, str], int] | None = None,
+) -> str:
     """
     Generate unique filename by adding suffix.
 
     Args:
         base_path: Base directory
         original_name: Original filename with relative path
+        taken: Relative paths already claimed but possibly not yet on disk
+        counters: Next counter per (directory, stem, suffix), updated in place
+            so repeated collisions on the same name don't probe from 1 again
 
     Returns:
-        Unique path (e.g., file.jpg -> file-1.jpg -> file-2.jpg)
+        Unique relative path (e.g., file.jpg -> file-1.jpg -> file-2.jpg)
     """
-    original_path = Path(original_name)
-    stem = original_path.stem
-    suffix = original_path.suffix
-    parent = base_path / original_path.parent
+    relative_parent, name = os.path.split(original_name)
+    stem, suffix = os.path.splitext(name)
+    parent = os.path.join(base_path, relative_parent)
+    key = (parent, stem, suffix)
 
-    counter = 1
+    counter = counters.get(key, 1) if counters is not None else 1
     while True:
         new_name = f"{stem}-{counter}{suffix}"
-        new_path = parent / new_name
-        if not new_path.exists():
-            # Return relative path
-            return Path(original_path.parent) / new_name
+        new_relative_path = os.path.join(relative_parent, new_name)
+        if new_relative_path not in taken and not os.path.exists(os.path.join(parent, new_name)):
+            if counters is not None:
+                counters[key] = counter + 1
+            return new_relative_path
         counter += 1
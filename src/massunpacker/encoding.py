@@ -1,5 +1,6 @@
 """Encoding detection and handling for zip archive filenames."""
 
+import functools
 import logging
 from typing import Tuple
 
@@ -8,11 +9,16 @@ logger = logging.getLogger(__name__)
 # Encodings to try, in order of preference
 ENCODINGS = ["utf-8", "cp866", "cp1251", "latin1"]
 
+# Filenames repeat a lot across archives, so decoding results are memoized
+FILENAME_CACHE_SIZE = 65536
+
 
 def decode_filename(raw_bytes: bytes, tried_encodings: list[str] | None = None) -> Tuple[str, str | None]:
     """
     Try to decode filename from bytes using various encodings.
 
+    All encodings are expected to be ASCII-compatible.
+
     Args:
         raw_bytes: Raw bytes of filename
         tried_encodings: List of encodings to try (None for defaults)
@@ -23,15 +29,35 @@ def decode_filename(raw_bytes: bytes, tried_encodings: list[str] | None = None)
     if tried_encodings is None:
         tried_encodings = ENCODINGS
 
-    for encoding in tried_encodings:
-        try:
-            decoded = raw_bytes.decode(encoding)
-            # Check if decoded string looks reasonable
-            if "\x00" not in decoded and decoded.isprintable() or any(ord(c) > 127 for c in decoded):
-                logger.debug(f"Successfully decoded filename using {encoding}")
-                return decoded, encoding
-        except (UnicodeDecodeError, UnicodeError):
-            continue
+    return _decode_filename(raw_bytes, tuple(tried_encodings))
+
+
+@functools.lru_cache(maxsize=FILENAME_CACHE_SIZE)
+def _decode_filename(raw_bytes: bytes, tried_encodings: Tuple[str, ...]) -> Tuple[str, str | None]:
+    """
+    Memoized implementation of decode_filename.
+
+    Args:
+        raw_bytes: Raw bytes of filename
+        tried_encodings: Encodings to try
+
+    Returns:
+        Tuple of (decoded_name, encoding_used or None if failed)
+    """
+    if raw_bytes.isascii():
+        # Every encoding decodes pure ASCII the same way, so check it once
+        decoded = raw_bytes.decode("ascii")
+        if "\x00" not in decoded and decoded.isprintable():
+            return decoded, "ascii"
+    else:
+        # High bytes always decode to non-ASCII characters, which are accepted
+        for encoding in tried_encodings:
+            try:
+                decoded = raw_bytes.decode(encoding)
+            except (UnicodeDecodeError, UnicodeError):
+                continue
+            logger.debug(f"Successfully decoded filename using {encoding}")
+            return decoded, encoding
 
     # Fallback: create safe filename from bytes
     logger.warning(f"Could not decode filename, using fallback: {raw_bytes[:50]}")
@@ -39,6 +65,7 @@ def decode_filename(raw_bytes: bytes, tried_encodings: list[str] | None = None)
     return safe_name, None
 
 
+@functools.lru_cache(maxsize=FILENAME_CACHE_SIZE)
 def fix_zip_filename(filename: str) -> str:
     """
     Fix potentially incorrectly decoded zip filename.
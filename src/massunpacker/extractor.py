@@ -1,18 +1,22 @@
 """Main extraction logic for massunpacker."""
 
 import logging
+import os
 import zipfile
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, MutableMapping, Tuple
 
-from .collision import CollisionMethod, CollisionTracker, generate_unique_name
+from .collision import CollisionMethod, CollisionTracker, FileEntry, generate_unique_name
 from .encoding import decode_filename, fix_zip_filename
 from .i18n import _
 from .utils import check_disk_space, is_safe_path
 
 logger = logging.getLogger(__name__)
 
+# Buffer size for streaming archive entries to disk
+COPY_BUFSIZE = 1024 * 1024
+
 
 @dataclass
 class ExtractionResult:
@@ -23,6 +27,7 @@ class ExtractionResult:
     files_extracted: int = 0
     files_skipped: int = 0  # Identical files
     files_renamed: int = 0  # Collisions
+    files_linked: int = 0  # Hardlinked to identical files under other names
     size_compressed: int = 0
     size_uncompressed: int = 0
     errors: List[str] = field(default_factory=list)
@@ -37,6 +42,9 @@ class Extractor:
         output_dir: Path,
         collision_method: CollisionMethod = CollisionMethod.HASH_FAST,
         safety_margin: int = 100 * 1024 * 1024,
+        collision_files: MutableMapping[str, FileEntry] | None = None,
+        dedup: bool = False,
+        content_index: MutableMapping[Tuple[int, int], str] | None = None,
     ):
         """
         Initialize extractor.
@@ -45,9 +53,23 @@ class Extractor:
             output_dir: Directory where files will be extracted
             collision_method: Method for detecting collisions
             safety_margin: Safety margin for disk space (bytes)
+            collision_files: Mapping shared with other extractors for collision
+                tracking (None for a private one)
+            dedup: Hardlink files whose content was already extracted under another name
+            content_index: Mapping shared with other extractors for dedup
+                (None for a private one)
         """
         self.output_dir = output_dir.resolve()
-        self.collision_tracker = CollisionTracker(method=collision_method)
+        self._output_dir_str = str(self.output_dir)
+        # Directories already created under output_dir
+        self._mkdir_cache: set[str] = set()
+        if dedup and content_index is None:
+            content_index = {}
+        self.collision_tracker = CollisionTracker(
+            method=collision_method,
+            files=collision_files,
+            content_index=content_index if dedup else None,
+        )
         self.safety_margin = safety_margin
 
     def extract_archive(self, archive_path: Path) -> ExtractionResult:
@@ -65,8 +87,14 @@ class Extractor:
 
         try:
             with zipfile.ZipFile(archive_path, "r") as zf:
-                # Calculate total uncompressed size
-                total_size = sum(info.file_size for info in zf.infolist())
+                # Collect files and their total uncompressed size in one pass
+                file_infos = []
+                total_size = 0
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    file_infos.append(info)
+                    total_size += info.file_size
                 result.size_uncompressed = total_size
 
                 # Check disk space
@@ -84,10 +112,7 @@ class Extractor:
                     return result
 
                 # Extract each file
-                for info in zf.infolist():
-                    if info.is_dir():
-                        continue
-
+                for info in file_infos:
                     try:
                         self._extract_file(zf, info, result)
                     except Exception as e:
@@ -130,61 +155,202 @@ class Extractor:
             # Fallback to raw bytes
             raw_name = info.filename.encode("cp437")
             filename, encoding = decode_filename(raw_name)
-            if encoding:
+            if encoding and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Decoded filename using {encoding}: {filename}")
 
         # Security check: prevent path traversal
-        target_path = self.output_dir / filename
-        if not is_safe_path(self.output_dir, target_path):
+        if not is_safe_path(filename):
             error_msg = _("Unsafe path detected: {path}").format(path=filename)
             logger.warning(error_msg)
             result.errors.append(error_msg)
             return
 
+        # Plain strings: Path arithmetic allocates several objects per entry
+        target_path = os.path.join(self._output_dir_str, filename)
+        parent, name = os.path.split(target_path)
+
         # Create parent directory
-        target_path.parent.mkdir(parents=True, exist_ok=True)
+        self._make_dir(parent)
 
-        # Extract to temporary location first
-        temp_path = target_path.parent / f".tmp_{target_path.name}"
+        # New name: stream straight to the final location (or link identical file).
+        # Only taken when nothing is on disk there: an existing file (e.g. from a
+        # previous run, possibly hardlinked) is replaced via temp file + rename below
+        if self.collision_tracker.reserve(filename):
+            try:
+                linked = self._link_duplicate(zf, info, target_path)
+                size = info.file_size if linked else self._copy_entry(zf, info, target_path, exclusive=True)
+            except FileExistsError:
+                self.collision_tracker.discard(filename)
+            except Exception:
+                self.collision_tracker.discard(filename)
+                raise
+            else:
+                self.collision_tracker.register_precomputed(filename, size, crc=info.CRC)
+                if linked:
+                    result.files_linked += 1
+                else:
+                    result.files_extracted += 1
+                return
+
+        # Name already taken: extract to temporary location for comparison
+        # (named per process, workers may share output_dir)
+        temp_path = os.path.join(parent, f".tmp_{os.getpid()}_{name}")
 
         try:
             # Extract file
-            with zf.open(info) as source, open(temp_path, "wb") as target:
-                target.write(source.read())
+            size = self._copy_entry(zf, info, temp_path)
 
             # Check for collision
-            is_collision, files_identical = self.collision_tracker.check_collision(filename, temp_path)
+            is_collision, files_identical = self.collision_tracker.check_collision(
+                filename, temp_path, target_path, crc=info.CRC
+            )
 
             if is_collision:
                 if files_identical:
                     # Same file, skip
-                    logger.debug(f"Skipping identical file: {filename}")
-                    temp_path.unlink()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Skipping identical file: {filename}")
+                    os.unlink(temp_path)
                     result.files_skipped += 1
                 else:
-                    # Different file, rename
-                    new_relative_path = generate_unique_name(self.output_dir, filename)
-                    new_target_path = self.output_dir / new_relative_path
-                    new_target_path.parent.mkdir(parents=True, exist_ok=True)
+                    # Different file, rename (retry if another worker claimed the name first)
+                    while True:
+                        new_relative_path = generate_unique_name(
+                            self._output_dir_str,
+                            filename,
+                            self.collision_tracker.files,
+                            self.collision_tracker.name_counters,
+                        )
+                        if self.collision_tracker.reserve(new_relative_path):
+                            break
 
-                    temp_path.rename(new_target_path)
-                    self.collision_tracker.register_file(str(new_relative_path), new_target_path)
+                    self._move_into_place(temp_path, new_relative_path, size, info.CRC)
 
                     result.files_renamed += 1
-                    result.collisions.append((filename, str(new_relative_path)))
+                    result.collisions.append((filename, new_relative_path))
 
-                    logger.warning(
-                        _("Collision detected: {old} -> {new}").format(
-                            old=filename, new=str(new_relative_path)
+                    # Collisions are reported together with the archive summary
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            _("Collision detected: {old} -> {new}").format(old=filename, new=new_relative_path)
                         )
-                    )
             else:
                 # New file, move to final location
-                temp_path.rename(target_path)
+                self._move_into_place(temp_path, filename, size, info.CRC)
                 result.files_extracted += 1
 
         except Exception as e:
             # Clean up temp file
-            if temp_path.exists():
-                temp_path.unlink()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
             raise
+
+    def _move_into_place(self, temp_path: str, relative_path: str, size: int, crc: int) -> None:
+        """
+        Move extracted file to its reserved path and register it there.
+
+        The file is registered only once it is in place, so other workers
+        waiting on the reservation never compare against a missing or stale file.
+
+        Args:
+            temp_path: Path of extracted temp file
+            relative_path: Reserved relative path in output directory
+            size: File size in bytes
+            crc: CRC32 of file
+        """
+        target_path = os.path.join(self._output_dir_str, relative_path)
+        try:
+            self._make_dir(os.path.dirname(target_path))
+            os.rename(temp_path, target_path)
+        except BaseException:
+            self.collision_tracker.discard(relative_path)
+            raise
+        self.collision_tracker.register_precomputed(relative_path, size, crc=crc)
+
+    def _make_dir(self, path: str) -> None:
+        """
+        Create directory (with parents), once per directory.
+
+        Args:
+            path: Directory path
+        """
+        if path not in self._mkdir_cache:
+            os.makedirs(path, exist_ok=True)
+            self._mkdir_cache.add(path)
+
+    def _link_duplicate(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo, target_path: str) -> bool:
+        """
+        Hardlink target to already extracted file with same content, if dedup is enabled.
+
+        Candidates are found by size and CRC32 from zip headers. Unless only sizes
+        are compared, the entry is then hashed (without writing it) and compared
+        with the candidate.
+
+        Only used for entries whose name is new. Entries renamed because of a
+        collision are already written to a temp file and are kept as regular copies.
+
+        Args:
+            zf: Open ZipFile object
+            info: ZipInfo for file to extract
+            target_path: Path to create link at
+
+        Returns:
+            True if linked, False if entry must be written
+        """
+        tracker = self.collision_tracker
+        duplicate = tracker.find_duplicate(info.file_size, info.CRC)
+        if duplicate is None:
+            return False
+
+        duplicate_path = os.path.join(self._output_dir_str, duplicate)
+        try:
+            if tracker.method != CollisionMethod.SIZE:
+                duplicate_hash = tracker.file_hash(duplicate, duplicate_path)
+                with zf.open(info) as source:
+                    if tracker.hash_stream(source) != duplicate_hash:
+                        return False
+            os.link(duplicate_path, target_path)
+        except OSError:
+            # Not moved in place yet, target left from a previous run,
+            # or filesystem without hardlinks
+            return False
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Linked identical file: {target_path} -> {duplicate_path}")
+        return True
+
+    def _copy_entry(
+        self, zf: zipfile.ZipFile, info: zipfile.ZipInfo, target_path: str, exclusive: bool = False
+    ) -> int:
+        """
+        Stream archive entry to file.
+
+        If writing or closing the file fails, the partially written file is removed.
+
+        Args:
+            zf: Open ZipFile object
+            info: ZipInfo for file to extract
+            target_path: Path to write file to
+            exclusive: Fail instead of overwriting existing file
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            FileExistsError: If exclusive and target_path exists
+        """
+        size = 0
+
+        with zf.open(info) as source:
+            target = open(target_path, "xb" if exclusive else "wb")
+            # File is ours from here on; buffered write errors may only surface on close
+            try:
+                with target:
+                    while chunk := source.read(COPY_BUFSIZE):
+                        target.write(chunk)
+                        size += len(chunk)
+            except BaseException:
+                os.unlink(target_path)
+                raise
+
+        return size
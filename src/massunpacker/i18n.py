@@ -1,11 +1,16 @@
 """Internationalization support using gettext."""
 
+import functools
 import gettext
 import locale
 from pathlib import Path
+from typing import Callable
 
 # Global translator
 _translator = None
+# Bound methods of global translator, to skip attribute lookups per message
+_gettext: Callable[[str], str] | None = None
+_ngettext: Callable[[str, str, int], str] | None = None
 
 
 def setup_i18n(domain: str = "massunpacker", localedir: Path | None = None) -> None:
@@ -16,7 +21,7 @@ def setup_i18n(domain: str = "massunpacker", localedir: Path | None = None) -> N
         domain: Translation domain name
         localedir: Directory containing locale files (None for default)
     """
-    global _translator
+    global _translator, _gettext, _ngettext
 
     if localedir is None:
         # Default locale directory relative to package
@@ -24,7 +29,7 @@ def setup_i18n(domain: str = "massunpacker", localedir: Path | None = None) -> N
 
     # Try to get system locale
     try:
-        lang, _ = locale.getdefaultlocale()
+        lang, _encoding = locale.getdefaultlocale()
     except Exception:
         lang = "en_US"
 
@@ -36,7 +41,13 @@ def setup_i18n(domain: str = "massunpacker", localedir: Path | None = None) -> N
     except Exception:
         _translator = gettext.NullTranslations()
 
+    _gettext = _translator.gettext
+    _ngettext = _translator.ngettext
+    # Cached translations belong to the previous catalog
+    _.cache_clear()
 
+
+@functools.lru_cache(maxsize=256)
 def _(message: str) -> str:
     """
     Translate message.
@@ -47,12 +58,10 @@ def _(message: str) -> str:
     Returns:
         Translated message
     """
-    global _translator
-
-    if _translator is None:
+    if _gettext is None:
         setup_i18n()
 
-    return _translator.gettext(message)
+    return _gettext(message)
 
 
 def _n(singular: str, plural: str, n: int) -> str:
@@ -67,9 +76,7 @@ def _n(singular: str, plural: str, n: int) -> str:
     Returns:
         Translated message
     """
-    global _translator
-
-    if _translator is None:
+    if _ngettext is None:
         setup_i18n()
 
-    return _translator.ngettext(singular, plural, n)
+    return _ngettext(singular, plural, n)
@@ -1,10 +1,73 @@
 """Utility functions for massunpacker."""
 
+import fnmatch
+import heapq
+import os
+import queue
+import re
 import shutil
-from pathlib import Path
-from typing import Iterator
+import threading
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Iterator, Sequence
 
-from natsort import natsorted
+from natsort import natsort_keygen
+
+
+# Characters that make a path component a glob pattern
+_GLOB_MAGIC = re.compile(r"[*?[]")
+# Match patterns case-insensitively where the filesystem usually is
+_GLOB_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _iter_glob(base_dir: str, parts: list[str]) -> Iterator[str]:
+    """
+    Yield files under base_dir matching glob pattern components.
+
+    Uses os.scandir so that file type checks come from directory entries
+    instead of extra stat calls.
+
+    Args:
+        base_dir: Directory to match against
+        parts: Remaining pattern components ("**" matches any number of directories)
+
+    Yields:
+        Paths of matching files
+    """
+    part, rest = parts[0], parts[1:]
+
+    if part == "**":
+        if rest:
+            yield from _iter_glob(base_dir, rest)
+        try:
+            with os.scandir(base_dir) as it:
+                subdirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for subdir in subdirs:
+            yield from _iter_glob(subdir, parts)
+        return
+
+    if not _GLOB_MAGIC.search(part):
+        path = os.path.join(base_dir, part)
+        if rest:
+            if os.path.isdir(path):
+                yield from _iter_glob(path, rest)
+        elif os.path.isfile(path):
+            yield path
+        return
+
+    regex = re.compile(fnmatch.translate(part), _GLOB_FLAGS)
+    try:
+        with os.scandir(base_dir) as it:
+            entries = [entry for entry in it if regex.match(entry.name)]
+    except OSError:
+        return
+    for entry in entries:
+        if rest:
+            if entry.is_dir():
+                yield from _iter_glob(entry.path, rest)
+        elif entry.is_file():
+            yield entry.path
 
 
 def get_sorted_zip_files(patterns: list[str], limit: int | None = None) -> list[Path]:
@@ -18,41 +81,108 @@ def get_sorted_zip_files(patterns: list[str], limit: int | None = None) -> list[
     Returns:
         List of Path objects for matching zip files, naturally sorted
     """
-    all_files = set()
+    all_files: set[str] = set()
 
     for pattern in patterns:
-        path = Path(pattern)
-
         # Check if it's an existing file
-        if path.exists() and path.is_file():
-            all_files.add(path.resolve())
+        if os.path.isfile(pattern):
+            all_files.add(os.path.abspath(pattern))
         # Otherwise treat as glob pattern
         elif "*" in pattern or "?" in pattern:
-            # Find the base directory from pattern
-            parts = pattern.split("*")[0]
-            if "/" in parts or "\\" in parts:
-                base_dir = Path(parts).parent
-                relative_pattern = pattern.replace(str(base_dir) + "/", "").replace(str(base_dir) + "\\", "")
-            else:
-                base_dir = Path.cwd()
-                relative_pattern = pattern
-
-            # Get all matching files
-            matches = base_dir.glob(relative_pattern)
-            all_files.update(p.resolve() for p in matches if p.is_file())
+            drive, tail = os.path.splitdrive(os.path.abspath(pattern))
+            parts = [part for part in tail.split(os.sep) if part]
+            all_files.update(_iter_glob(drive + os.sep, parts))
         else:
             # Try as file path even if doesn't exist yet (might be a typo, will error later)
-            if path.suffix.lower() == ".zip":
-                all_files.add(path.resolve())
+            if pattern.lower().endswith(".zip"):
+                all_files.add(os.path.abspath(pattern))
+
+    sort_key = natsort_keygen()
+
+    # Same archive reached through symlinks or hardlinks is processed once,
+    # under the path that sorts first
+    unique: dict[tuple[int, int] | str, str] = {}
+    for file in all_files:
+        try:
+            st = os.stat(file)
+            key: tuple[int, int] | str = (st.st_dev, st.st_ino)
+        except OSError:
+            key = file
+        current = unique.get(key)
+        if current is None or sort_key(file) < sort_key(current):
+            unique[key] = file
+
+    # Natural sort, only selecting the first files when limited
+    if limit is not None:
+        sorted_files = heapq.nsmallest(limit, unique.values(), key=sort_key)
+    else:
+        sorted_files = sorted(unique.values(), key=sort_key)
 
-    # Natural sort
-    sorted_files = natsorted(list(all_files), key=lambda p: str(p))
+    return [Path(file) for file in sorted_files]
 
-    # Apply limit
-    if limit is not None:
-        sorted_files = sorted_files[:limit]
 
-    return sorted_files
+def _advise_willneed(path: Path) -> None:
+    """
+    Ask the OS to start reading file into page cache.
+
+    Args:
+        path: File to read ahead
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _readahead_worker(pending: "queue.Queue[Path | None]") -> None:
+    """
+    Read ahead files from queue until None is received.
+
+    Args:
+        pending: Queue of files to read ahead
+    """
+    while (path := pending.get()) is not None:
+        _advise_willneed(path)
+
+
+def prefetch_files(paths: Sequence[Path], depth: int = 2) -> Iterator[Path]:
+    """
+    Iterate over files, reading ahead the next ones in background.
+
+    While the caller processes a file, a background thread asks the OS to load
+    the following `depth` files into page cache, hiding disk latency behind
+    the current work. Without posix_fadvise (e.g. Windows, macOS) files are
+    just yielded in order.
+
+    Args:
+        paths: Files to iterate over
+        depth: Number of files to read ahead
+
+    Yields:
+        Files from paths, in order
+    """
+    if not hasattr(os, "posix_fadvise"):
+        yield from paths
+        return
+
+    pending: "queue.Queue[Path | None]" = queue.Queue()
+    threading.Thread(target=_readahead_worker, args=(pending,), daemon=True).start()
+
+    try:
+        for path in paths[:depth]:
+            pending.put(path)
+        for i, path in enumerate(paths):
+            if i + depth < len(paths):
+                pending.put(paths[i + depth])
+            yield path
+    finally:
+        pending.put(None)
 
 
 def check_disk_space(target_dir: Path, required_bytes: int, safety_margin: int = 100 * 1024 * 1024) -> tuple[bool, int]:
@@ -91,21 +221,20 @@ def ensure_directory(path: Path, description: str = "directory") -> None:
         raise RuntimeError(f"Cannot create {description} at {path}: {e}") from e
 
 
-def is_safe_path(base_dir: Path, target_path: Path) -> bool:
+def is_safe_path(filename: str) -> bool:
     """
-    Check if target path is safe (no path traversal).
+    Check if archive member name is safe to extract (no path traversal).
+
+    The check is purely lexical: it never touches the filesystem, so it cannot
+    be fooled by symlinks created by earlier entries.
 
     Args:
-        base_dir: Base directory that should contain the target
-        target_path: Target path to check
+        filename: Member name relative to the archive root
 
     Returns:
         True if path is safe, False otherwise
     """
-    try:
-        # Resolve both paths and check if target is under base
-        base_resolved = base_dir.resolve()
-        target_resolved = target_path.resolve()
-        return target_resolved.is_relative_to(base_resolved)
-    except (ValueError, OSError):
+    path = PurePosixPath(filename.replace("\\", "/"))
+    if path.is_absolute() or PureWindowsPath(filename).drive:
         return False
+    return ".." not in path.parts
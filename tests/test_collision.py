@@ -0,0 +1,62 @@
+"""Tests for collision tracking."""
+
+from massunpacker import collision
+from massunpacker.collision import CollisionTracker, generate_unique_name
+
+
+def test_stale_reservation_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(collision, "RESERVATION_TIMEOUT", 0.05)
+    # Reserved by a worker that died before registering the file
+    tracker = CollisionTracker(files={"a.txt": (-1, "reserved-0", None)})
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"content")
+
+    assert tracker.check_collision("a.txt", path) == (True, False)
+    assert tracker.files["a.txt"] == (-1, "reserved-0", None)
+
+
+def test_new_file_stays_reserved_until_registered(tmp_path):
+    tracker = CollisionTracker()
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"content")
+
+    assert tracker.check_collision("a.txt", path) == (False, False)
+    # Not moved in place yet: other workers must keep waiting
+    assert tracker.files["a.txt"][0] == -1
+
+    tracker.register_precomputed("a.txt", 7, crc=1)
+    assert tracker.files["a.txt"] == (7, None, 1)
+
+
+def test_unique_names_continue_from_counter(tmp_path, monkeypatch):
+    probed = []
+    exists = collision.os.path.exists
+
+    def recording_exists(path):
+        probed.append(path)
+        return exists(path)
+
+    monkeypatch.setattr(collision.os.path, "exists", recording_exists)
+    taken: set[str] = {"d/file.ext"}
+    counters: dict = {}
+
+    names = []
+    for _ in range(3):
+        name = generate_unique_name(tmp_path, "d/file.ext", taken, counters)
+        taken.add(name)
+        names.append(name)
+
+    assert names == ["d/file-1.ext", "d/file-2.ext", "d/file-3.ext"]
+    # One probe per name instead of starting from -1 every time
+    assert len(probed) == 3
+
+
+def test_unique_name_skips_existing_file_with_stale_counter(tmp_path):
+    counters: dict = {}
+    assert generate_unique_name(tmp_path, "file.ext", (), counters) == "file-1.ext"
+
+    # Created behind the tracker's back (e.g. by a previous run)
+    (tmp_path / "file-2.ext").write_bytes(b"")
+
+    assert generate_unique_name(tmp_path, "file.ext", (), counters) == "file-3.ext"
+    assert generate_unique_name(tmp_path, "file.ext", (), counters) == "file-4.ext"
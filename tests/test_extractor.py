@@ -0,0 +1,171 @@
+"""Tests for archive extraction."""
+
+import errno
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+
+from massunpacker import CollisionMethod, CollisionTracker, Extractor
+from massunpacker import extractor as extractor_module
+
+
+def make_zip(path: Path, entries: dict[str, bytes]) -> Path:
+    """Create stored (uncompressed) zip archive with given entries."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return path
+
+
+def corrupt(path: Path, data: bytes) -> None:
+    """Flip first byte of stored entry data, so its CRC-32 no longer matches."""
+    raw = path.read_bytes()
+    assert raw.count(data) == 1
+    path.write_bytes(raw.replace(data, bytes([data[0] ^ 0xFF]) + data[1:]))
+
+
+def test_bad_entry_keeps_existing_target(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "keep.txt").write_bytes(b"precious old content")
+
+    archive = make_zip(tmp_path / "a.zip", {"keep.txt": b"new content from archive"})
+    corrupt(archive, b"new content from archive")
+
+    result = Extractor(out).extract_archive(archive)
+
+    assert result.errors
+    assert (out / "keep.txt").read_bytes() == b"precious old content"
+    assert sorted(p.name for p in out.iterdir()) == ["keep.txt"]
+
+
+def test_existing_target_replaced_after_extraction(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "keep.txt").write_bytes(b"old")
+
+    archive = make_zip(tmp_path / "a.zip", {"keep.txt": b"new"})
+    result = Extractor(out).extract_archive(archive)
+
+    assert not result.errors
+    assert result.files_extracted == 1
+    assert (out / "keep.txt").read_bytes() == b"new"
+    assert sorted(p.name for p in out.iterdir()) == ["keep.txt"]
+
+
+def test_rerun_does_not_write_through_hardlinks(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+
+    first = make_zip(tmp_path / "1.zip", {"A.txt": b"same content", "B.txt": b"same content"})
+    result = Extractor(out, dedup=True).extract_archive(first)
+    assert result.files_linked == 1
+    assert (out / "A.txt").stat().st_ino == (out / "B.txt").stat().st_ino
+
+    # New run (fresh tracker) into the same output directory
+    second = make_zip(tmp_path / "2.zip", {"B.txt": b"DIFFERENT"})
+    result = Extractor(out, dedup=True).extract_archive(second)
+
+    assert not result.errors
+    assert (out / "A.txt").read_bytes() == b"same content"
+    assert (out / "B.txt").read_bytes() == b"DIFFERENT"
+
+
+def test_same_size_different_crc_renamed_without_hashing(tmp_path, monkeypatch):
+    def no_hash(self, file_path):
+        raise AssertionError("files with different CRC-32 must not be hashed")
+
+    monkeypatch.setattr(CollisionTracker, "_compute_hash", no_hash)
+    out = tmp_path / "out"
+    out.mkdir()
+    extractor = Extractor(out)
+
+    extractor.extract_archive(make_zip(tmp_path / "1.zip", {"a.txt": b"first"}))
+    result = extractor.extract_archive(make_zip(tmp_path / "2.zip", {"a.txt": b"other"}))
+
+    assert not result.errors
+    assert result.files_renamed == 1
+    assert (out / "a.txt").read_bytes() == b"first"
+    assert (out / result.collisions[0][1]).read_bytes() == b"other"
+
+
+def test_archive_truncated_during_extraction(tmp_path, monkeypatch):
+    out = tmp_path / "out"
+    out.mkdir()
+    entries = {f"f{i}.txt": bytes([i]) * 4096 for i in range(10)}
+    archive = make_zip(tmp_path / "a.zip", entries)
+
+    extract_file = Extractor._extract_file
+
+    def truncate_after_first(self, zf, info, result):
+        extract_file(self, zf, info, result)
+        with open(archive, "r+b") as f:
+            f.truncate(1024)
+
+    monkeypatch.setattr(Extractor, "_extract_file", truncate_after_first)
+    result = Extractor(out).extract_archive(archive)
+
+    # Shrunk archive is reported per entry instead of crashing the process
+    assert (out / "f0.txt").read_bytes() == entries["f0.txt"]
+    assert len(result.errors) == 9
+
+
+def test_close_error_removes_partial_file(tmp_path, monkeypatch):
+    class FailingClose(io.BufferedWriter):
+        def close(self):
+            super().close()
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+    def failing_open(path, mode):
+        return FailingClose(io.FileIO(path, mode.replace("b", "")))
+
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "old.txt").write_bytes(b"old")
+    archive = make_zip(tmp_path / "a.zip", {"new.txt": b"new", "old.txt": b"replacement"})
+
+    monkeypatch.setattr(extractor_module, "open", failing_open, raising=False)
+    result = Extractor(out).extract_archive(archive)
+
+    # Neither the direct path nor the temp file leaves a partial file behind
+    assert len(result.errors) == 2
+    assert sorted(p.name for p in out.iterdir()) == ["old.txt"]
+    assert (out / "old.txt").read_bytes() == b"old"
+
+
+def test_identical_entry_skipped_existing_hashed_once(tmp_path, monkeypatch):
+    hashed = []
+    compute_hash = CollisionTracker._compute_hash
+
+    def recording_hash(self, file_path):
+        hashed.append(str(file_path))
+        return compute_hash(self, file_path)
+
+    monkeypatch.setattr(CollisionTracker, "_compute_hash", recording_hash)
+    out = tmp_path / "out"
+    out.mkdir()
+    extractor = Extractor(out, collision_method=CollisionMethod.HASH_SHA256)
+
+    for i in range(3):
+        result = extractor.extract_archive(make_zip(tmp_path / f"{i}.zip", {"a.txt": b"same"}))
+        assert not result.errors
+
+    assert result.files_skipped == 1
+    assert sorted(p.name for p in out.iterdir()) == ["a.txt"]
+    # Existing file is hashed on first collision only, then taken from the tracker
+    assert hashed.count(str(out / "a.txt")) == 1
+    assert extractor.collision_tracker.files["a.txt"][1] == hashlib.sha256(b"same").hexdigest()
+
+
+def test_traversal_entry_reported_not_written(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    archive = make_zip(tmp_path / "a.zip", {"../escape.txt": b"bad", "ok.txt": b"good"})
+
+    result = Extractor(out).extract_archive(archive)
+
+    assert len(result.errors) == 1
+    assert "../escape.txt" in result.errors[0]
+    assert not (tmp_path / "escape.txt").exists()
+    assert sorted(p.name for p in out.iterdir()) == ["ok.txt"]
@@ -0,0 +1,32 @@
+"""Tests for utility functions."""
+
+import os
+
+import pytest
+
+from massunpacker.utils import get_sorted_zip_files, is_safe_path
+
+
+def test_symlinked_dir_archives_listed_once(tmp_path):
+    real = tmp_path / "real"
+    real.mkdir()
+    for name in ("a10.zip", "a2.zip"):
+        (real / name).write_bytes(b"PK")
+    os.symlink(real, tmp_path / "link")
+
+    files = get_sorted_zip_files([str(tmp_path / "*" / "*.zip")])
+
+    assert files == [tmp_path / "link" / "a2.zip", tmp_path / "link" / "a10.zip"]
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["../x", "a/../../x", "a/..", "/abs", "C:x", "C:/x", "\\\\srv\\x", "..\\x", "a\\..\\..\\x"],
+)
+def test_unsafe_paths_rejected(name):
+    assert not is_safe_path(name)
+
+
+@pytest.mark.parametrize("name", ["a.txt", "a/b/c.txt", "a/..b", "..b/c", "a/b../c"])
+def test_safe_paths_allowed(name):
+    assert is_safe_path(name)